@@ -1,93 +1,246 @@
 import os
 import re
-import datetime  # Import datetime for date operations
+import sys
+import time
 import difflib
+import functools
+import shutil
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from rich.progress import Progress, TextColumn, BarColumn, TimeElapsedColumn
 
+# Optional JIT-compiled Jaccard kernel for bulk candidate scoring; the pure
+# Python set-based path below is used when numba/numpy are not installed
+try:
+    import numpy as np
+    from numba import njit
+    _HAVE_NUMBA = True
+except Exception:
+    _HAVE_NUMBA = False
+
+# Compiled once at import time; sanitize_filename runs once per file, so
+# re-parsing these patterns (and scanning a huge regex alternation) per call
+# adds up on large batches.
+_SANITIZE_STOPWORDS = frozenset({
+    'jpg', 'jpeg', 'png', 'gif', 'bmp', 'txt', 'md', 'pdf', 'docx', 'xls', 'xlsx', 'csv', 'ppt', 'pptx',
+    'image', 'picture', 'photo', 'this', 'that', 'these', 'those', 'here', 'there',
+    'please', 'note', 'additional', 'notes', 'folder', 'name', 'sure', 'heres', 'a', 'an', 'the', 'and', 'of', 'in',
+    'to', 'for', 'on', 'with', 'your', 'answer', 'should', 'be', 'only', 'summary', 'summarize', 'text', 'category',
+})
+_NONWORD_RE = re.compile(r'[^\w\s]')
+_WORD_SEP_RE = re.compile(r'[\s_]+')
+
+class Operation:
+    """A single planned file operation.
+
+    __slots__ instances cost a fraction of a dict's memory, which matters
+    when a run plans hundreds of thousands of operations, and attribute
+    access is faster than key lookup in the execution loop.
+    """
+    __slots__ = ('source', 'destination', 'link_type', 'folder_name',
+                 'original_folder_name', 'new_file_name', 'unclassified')
+
+    def __init__(self, source, destination, link_type,
+                 folder_name=None, original_folder_name=None,
+                 new_file_name=None, unclassified=False):
+        self.source = source
+        self.destination = destination
+        self.link_type = link_type
+        self.folder_name = folder_name
+        self.original_folder_name = original_folder_name
+        self.new_file_name = new_file_name
+        self.unclassified = unclassified
+
+
 def sanitize_filename(name, max_length=50, max_words=5):
     """Sanitize the filename by removing unwanted words and characters."""
     # Remove file extension if present
-    name = os.path.splitext(name)[0]
-    # Remove unwanted words and data type words
-    name = re.sub(
-        r'\b(jpg|jpeg|png|gif|bmp|txt|md|pdf|docx|xls|xlsx|csv|ppt|pptx|image|picture|photo|this|that|these|those|here|there|'
-        r'please|note|additional|notes|folder|name|sure|heres|a|an|the|and|of|in|'
-        r'to|for|on|with|your|answer|should|be|only|summary|summarize|text|category)\b',
-        '',
-        name,
-        flags=re.IGNORECASE
-    )
+    name = os.path.splitext(name)[0].lower()
     # Remove non-word characters except underscores
-    sanitized = re.sub(r'[^\w\s]', '', name).strip()
-    # Replace multiple underscores or spaces with a single underscore
-    sanitized = re.sub(r'[\s_]+', '_', sanitized)
-    # Convert to lowercase
-    sanitized = sanitized.lower()
-    # Remove leading/trailing underscores
-    sanitized = sanitized.strip('_')
-    # Split into words and limit the number of words
-    words = sanitized.split('_')
-    limited_words = [word for word in words if word]  # Remove empty strings
-    limited_words = limited_words[:max_words]
-    limited_name = '_'.join(limited_words)
-    # Limit length
+    name = _NONWORD_RE.sub('', name)
+    # Split into words, dropping unwanted/data-type words in a single pass
+    words = [w for w in _WORD_SEP_RE.split(name) if w and w not in _SANITIZE_STOPWORDS]
+    # Limit the number of words and the overall length
+    limited_name = '_'.join(words[:max_words])
     return limited_name[:max_length] if limited_name else 'untitled'
 
 
 def _list_existing_relative_dirs(root_dir: str):
     """Return a list of existing subdirectory relative paths under root_dir.
     If the root does not exist yet, returns an empty list.
+    Results are memoized on (root_dir, mtime) so repeated calls within a
+    run (one per processing mode) only walk the filesystem once.
     """
-    rel_dirs = []
     if not os.path.isdir(root_dir):
-        return rel_dirs
-    for dirpath, dirnames, _ in os.walk(root_dir):
-        if dirpath == root_dir:
-            for d in dirnames:
-                rel_dirs.append(d)
+        return []
+    try:
+        mtime_ns = os.stat(root_dir).st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    return list(_scan_relative_dirs(root_dir, mtime_ns))
+
+
+@functools.lru_cache(maxsize=8)
+def _scan_relative_dirs(root_dir: str, _mtime_ns):
+    """Walk root_dir with os.scandir and return subdir relative paths.
+    Walks with os.scandir so the dirent type cached by readdir is reused
+    instead of issuing an extra stat per entry (as os.walk does). Returns
+    a tuple so the cached value cannot be mutated by callers.
+    """
+    rel_dirs = []
+    stack = [('', root_dir)]
+    while stack:
+        rel_prefix, dir_path = stack.pop()
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        rel = entry.name if not rel_prefix else rel_prefix + os.sep + entry.name
+                        rel_dirs.append(rel)
+                        stack.append((rel, entry.path))
+        except OSError:
+            # Unreadable subdirectory; skip it like os.walk would
             continue
-        rel = os.path.relpath(dirpath, root_dir)
-        if rel != ".":
-            rel_dirs.append(rel)
-    return sorted(set(rel_dirs))
+    return tuple(sorted(set(rel_dirs)))
+
+
+# Tokenizer tables and patterns, built once at import time; these run per
+# (file, candidate) pair in the folder-matching hot path
+_TOKEN_SYNONYMS = {
+    'images': 'image', 'image': 'image', 'photos': 'image', 'pics': 'image', 'pictures': 'image',
+    'texts': 'text', 'text': 'text', 'documents': 'doc', 'document': 'doc', 'docs': 'doc',
+    'pdfs': 'pdf', 'pdf': 'pdf', 'xls': 'xls', 'xlsx': 'xls', 'spreadsheets': 'xls',
+    'powerpoint': 'ppt', 'presentations': 'ppt', 'presentation': 'ppt', 'pptx': 'ppt', 'ppt': 'ppt',
+    'ebooks': 'ebook', 'ebook': 'ebook', 'books': 'ebook', 'book': 'ebook',
+    'others': 'other', 'other': 'other'
+}
+# Interned canonical tokens make the hot Jaccard set operations compare by
+# pointer identity instead of hashing full strings
+_TOKEN_SYNONYMS = {k: sys.intern(v) for k, v in _TOKEN_SYNONYMS.items()}
+_TOK_SEP_RE = re.compile(r'[^a-z0-9/]+')
+_WORD_SPLIT_RE = re.compile(r'[_\-]+')
+_ALNUM_UND_RE = re.compile(r'[^a-z0-9]+')
 
 
 def _normalize_token(tok: str) -> str:
     t = tok.lower()
-    synonyms = {
-        'images': 'image', 'image': 'image', 'photos': 'image', 'pics': 'image', 'pictures': 'image',
-        'texts': 'text', 'text': 'text', 'documents': 'doc', 'document': 'doc', 'docs': 'doc',
-        'pdfs': 'pdf', 'pdf': 'pdf', 'xls': 'xls', 'xlsx': 'xls', 'spreadsheets': 'xls',
-        'powerpoint': 'ppt', 'presentations': 'ppt', 'presentation': 'ppt', 'pptx': 'ppt', 'ppt': 'ppt',
-        'ebooks': 'ebook', 'ebook': 'ebook', 'books': 'ebook', 'book': 'ebook',
-        'others': 'other', 'other': 'other'
-    }
-    return synonyms.get(t, t.rstrip('s'))
+    canon = _TOKEN_SYNONYMS.get(t)
+    return canon if canon is not None else sys.intern(t.rstrip('s'))
 
 
 def _tokenize_path(rel_path: str) -> set:
     s = rel_path.replace('\\', '/').lower()
-    s = re.sub(r'[^a-z0-9/]+', '_', s)
+    s = _TOK_SEP_RE.sub('_', s)
     parts = [p for p in s.split('/') if p]
     tokens = []
     for p in parts:
-        for tok in re.split(r'[_\-]+', p):
+        for tok in _WORD_SPLIT_RE.split(p):
             if tok:
                 tokens.append(_normalize_token(tok))
     return set(tokens)
 
 
+@functools.lru_cache(maxsize=4096)
+def _path_profile(rel_path: str):
+    """Return (token set, normalized string) for a relative path.
+    Cached so each candidate is tokenized once per run instead of once
+    per (file, candidate) comparison.
+    """
+    norm = _ALNUM_UND_RE.sub('_', rel_path.lower())
+    return frozenset(_tokenize_path(rel_path)), norm
+
+
+def _jaccard(ta: frozenset, tb: frozenset) -> float:
+    """Token-set Jaccard similarity. The union size is derived from the
+    intersection so no union set is materialized."""
+    if not (ta or tb):
+        return 0.0
+    inter = len(ta & tb)
+    return inter / (len(ta) + len(tb) - inter)
+
+
+# Lazily grown token vocabulary for the JIT kernel; each distinct token gets
+# a stable int id so token sets become sorted int32 arrays
+_token_ids: dict = {}
+
+if _HAVE_NUMBA:
+    @njit(cache=True)
+    def _jaccard_sorted(a, b):
+        """Two-pointer Jaccard over sorted int32 id arrays."""
+        la = a.shape[0]
+        lb = b.shape[0]
+        if la == 0 and lb == 0:
+            return 0.0
+        i = 0
+        j = 0
+        inter = 0
+        while i < la and j < lb:
+            if a[i] == b[j]:
+                inter += 1
+                i += 1
+                j += 1
+            elif a[i] < b[j]:
+                i += 1
+            else:
+                j += 1
+        return inter / (la + lb - inter)
+
+    @functools.lru_cache(maxsize=4096)
+    def _profile_ids(rel_path: str):
+        """Sorted int32 id array for a path's token set, cached per path."""
+        ids = []
+        for tok in _path_profile(rel_path)[0]:
+            tok_id = _token_ids.get(tok)
+            if tok_id is None:
+                tok_id = len(_token_ids)
+                _token_ids[tok] = tok_id
+            ids.append(tok_id)
+        ids.sort()
+        return np.asarray(ids, dtype=np.int32)
+
+
+# Beyond this combined length the quadratic matcher is not worth running;
+# token Jaccard alone decides
+_SEQ_MATCH_MAX_LEN = 256
+
+
+def _seq_ratio(a_norm: str, b_norm: str) -> float:
+    """SequenceMatcher ratio with guards against the quadratic worst case.
+    Pathologically long pairs score 0.0 (callers already have the Jaccard
+    score). A shared prefix/suffix is stripped before matching and its
+    length credited back into the ratio, which shrinks the quadratic part
+    for sibling paths that share e.g. a year/ prefix.
+    """
+    la, lb = len(a_norm), len(b_norm)
+    if la + lb > _SEQ_MATCH_MAX_LEN:
+        return 0.0
+    if not la or not lb:
+        return 0.0
+    i = 0
+    mn = min(la, lb)
+    while i < mn and a_norm[i] == b_norm[i]:
+        i += 1
+    j = 0
+    while j < mn - i and a_norm[la - 1 - j] == b_norm[lb - 1 - j]:
+        j += 1
+    matched = i + j
+    a_mid = a_norm[i:la - j]
+    b_mid = b_norm[i:lb - j]
+    if a_mid and b_mid:
+        sm = difflib.SequenceMatcher(None, a_mid, b_mid, autojunk=True)
+        matched += sum(block.size for block in sm.get_matching_blocks())
+    return (2.0 * matched) / (la + lb)
+
+
 def _similarity_score(rel_a: str, rel_b: str) -> float:
-    a_norm = re.sub(r'[^a-z0-9]+', '_', rel_a.lower())
-    b_norm = re.sub(r'[^a-z0-9]+', '_', rel_b.lower())
-    ratio = difflib.SequenceMatcher(None, a_norm, b_norm).ratio()
-    ta = _tokenize_path(rel_a)
-    tb = _tokenize_path(rel_b)
-    jacc = (len(ta & tb) / len(ta | tb)) if (ta or tb) else 0.0
+    ta, a_norm = _path_profile(rel_a)
+    tb, b_norm = _path_profile(rel_b)
+    jacc = _jaccard(ta, tb)
+    ratio = _seq_ratio(a_norm, b_norm)
     return max(ratio, jacc)
 
 
-def find_best_existing_subdir(output_path: str, desired_rel_path: str, existing_rel_dirs: list | None = None, threshold: float = 0.62) -> str:
+def find_best_existing_subdir(output_path: str, desired_rel_path: str, existing_rel_dirs: set | list | None = None, threshold: float = 0.62) -> str:
     """Map a desired relative subdirectory to the most similar already existing
     subdirectory under output_path. Returns desired_rel_path unchanged if no
     candidate meets the similarity threshold.
@@ -100,121 +253,214 @@ def find_best_existing_subdir(output_path: str, desired_rel_path: str, existing_
     if not existing_rel_dirs:
         return desired_rel_path
 
+    # Exact match: no point scoring candidates when the desired path is
+    # already among them
+    if desired_rel_path in existing_rel_dirs:
+        return desired_rel_path
+
+    desired_tokens, desired_norm = _path_profile(desired_rel_path)
+    n_desired = len(desired_tokens)
     best = None
     best_score = -1.0
-    for cand in existing_rel_dirs:
-        score = _similarity_score(desired_rel_path, cand)
+    # Visit candidates closest in length first: the most similar names tend
+    # to come up early, which lets the near-perfect-match break below fire
+    # before the expensive comparisons are spent on hopeless candidates
+    desired_len = len(desired_rel_path)
+    candidates = sorted(existing_rel_dirs, key=lambda cand: abs(len(cand) - desired_len))
+    desired_ids = _profile_ids(desired_rel_path) if _HAVE_NUMBA else None
+    for cand in candidates:
+        cand_tokens, cand_norm = _path_profile(cand)
+        n_cand = len(cand_tokens)
+        # Length prefilter: token counts this far apart bound Jaccard below
+        # the threshold, so the candidate cannot win. Only applied to
+        # larger token sets; short folder names may still match on the
+        # character-level fallback below.
+        if min(n_desired, n_cand) >= 3 and abs(n_desired - n_cand) / max(n_desired, n_cand) > 1.0 - threshold:
+            continue
+        if desired_ids is not None:
+            score = _jaccard_sorted(desired_ids, _profile_ids(cand))
+        else:
+            score = _jaccard(desired_tokens, cand_tokens)
+        if score < threshold and (desired_tokens & cand_tokens or (n_desired <= 2 and n_cand <= 2)):
+            # Only fall back to the quadratic SequenceMatcher where
+            # character-level similarity can still push a candidate over
+            # the line: shared tokens, or names short enough that typos
+            # (invisible to exact token matching) are plausible
+            ratio = _seq_ratio(desired_norm, cand_norm)
+            if ratio > score:
+                score = ratio
         if score > best_score:
             best_score = score
             best = cand
+            if best_score >= 0.99:
+                # Effectively a perfect match; stop scanning
+                break
     if best is not None and best_score >= threshold:
         return best
     return desired_rel_path
 
-def process_files_by_date(file_paths, output_path, dry_run=False, silent=False, log_file=None, link_type: str = 'hardlink'):
+# Month folder names, indexed by tm_mon - 1 (what strftime('%B') produced
+# under the default locale, without the per-call locale machinery)
+_MONTH_NAMES = ('January', 'February', 'March', 'April', 'May', 'June',
+                'July', 'August', 'September', 'October', 'November', 'December')
+
+
+def process_files_by_date(file_paths, output_path, dry_run=False, silent=False, log_file=None, link_type: str = 'hardlink', stat_cache: dict | None = None):
     """Process files to organize them by date.
     If the output directory already contains a similar year/month structure,
     reuse it instead of creating near-duplicate folders.
+    stat_cache may map file paths to os.stat_result objects captured during
+    collection (e.g. from a scandir walk), avoiding one stat syscall per file.
+    Yields operation dicts so large batches need not be held in memory.
     """
-    operations = []
-    existing_rel_dirs = _list_existing_relative_dirs(output_path)
+    existing_rel_dirs = set(_list_existing_relative_dirs(output_path))
+
+    # Phase 1: bucket files by (year, month) straight from time.localtime,
+    # which is far cheaper than building a datetime and strftime-ing it per
+    # file. No day-granular caching here: a cache keyed on the UTC day spans
+    # two local dates in non-UTC timezones, misfiling files near month
+    # boundaries.
+    buckets = defaultdict(list)
     for file_path in file_paths:
-        # Get the modification time
-        mod_time = os.path.getmtime(file_path)
-        # Convert to datetime
-        mod_datetime = datetime.datetime.fromtimestamp(mod_time)
-        year = mod_datetime.strftime('%Y')
-        month = mod_datetime.strftime('%B')  # e.g., 'January', or use '%m' for month number
-        # Determine desired relative path and align with existing structure
+        # Get the modification time, reusing a cached stat when available
+        cached = stat_cache.get(file_path) if stat_cache else None
+        mod_time = cached.st_mtime if cached is not None else os.path.getmtime(file_path)
+        tm = time.localtime(mod_time)
+        buckets[(str(tm.tm_year), _MONTH_NAMES[tm.tm_mon - 1])].append(file_path)
+
+    # Phase 2: align each bucket with the existing structure exactly once,
+    # then emit the operations for all of its files. Inside the loop paths
+    # are built by concatenation onto a precomputed prefix; os.path.join's
+    # argument handling is measurable overhead at this call frequency.
+    output_prefix = output_path if output_path.endswith(os.sep) else output_path + os.sep
+    for (year, month), bucket_paths in buckets.items():
         desired_rel = os.path.join(year, month)
         mapped_rel = find_best_existing_subdir(output_path, desired_rel, existing_rel_dirs)
         # Create directory path
-        dir_path = os.path.join(output_path, mapped_rel)
-        # Prepare new file path
-        new_file_name = os.path.basename(file_path)
-        new_file_path = os.path.join(dir_path, new_file_name)
-        # Record the operation
-        operation = {
-            'source': file_path,
-            'destination': new_file_path,
-            'link_type': link_type,
-        }
-        operations.append(operation)
-    return operations
+        dir_path = output_prefix + mapped_rel
+        dir_prefix = dir_path + os.sep
+        for file_path in bucket_paths:
+            # Prepare new file path
+            new_file_path = dir_prefix + os.path.basename(file_path)
+            # Record the operation
+            yield Operation(file_path, new_file_path, link_type)
+
+def preview_files_by_date(file_paths, output_path, stat_cache: dict | None = None):
+    """Count date-mode destinations without building per-file operations.
+    Returns (per_folder, by_ext) dicts mapping relative folder / extension
+    to file counts — all a dry-run summary needs.
+    """
+    existing_rel_dirs = set(_list_existing_relative_dirs(output_path))
+    per_folder = defaultdict(int)
+    by_ext = defaultdict(int)
+    bucket_counts = defaultdict(int)
+    for file_path in file_paths:
+        cached = stat_cache.get(file_path) if stat_cache else None
+        mod_time = cached.st_mtime if cached is not None else os.path.getmtime(file_path)
+        tm = time.localtime(mod_time)
+        bucket_counts[(str(tm.tm_year), _MONTH_NAMES[tm.tm_mon - 1])] += 1
+        by_ext[os.path.splitext(file_path)[1].lower()] += 1
+    for (year, month), count in bucket_counts.items():
+        mapped_rel = find_best_existing_subdir(output_path, os.path.join(year, month), existing_rel_dirs)
+        per_folder[mapped_rel] += count
+    return per_folder, by_ext
+
+
+# Extension dispatch tables for process_files_by_type, built once at import
+# time; a dict lookup replaces the per-file if/elif chain of tuple scans
+_IMAGE_EXTENSIONS = frozenset({'.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff'})
+_TEXT_EXT_SUBFOLDERS = {
+    '.txt': 'plain_text_files', '.md': 'plain_text_files',
+    '.doc': 'doc_files', '.docx': 'doc_files',
+    '.pdf': 'pdf_files',
+    '.xls': 'xls_files', '.xlsx': 'xls_files',
+    '.epub': 'ebooks', '.mobi': 'ebooks', '.azw': 'ebooks', '.azw3': 'ebooks',
+}
+_TEXT_EXT_DIRS = {ext: os.path.join('text_files', sub) for ext, sub in _TEXT_EXT_SUBFOLDERS.items()}
+
 
 def process_files_by_type(file_paths, output_path, dry_run=False, silent=False, log_file=None, link_type: str = 'hardlink'):
     """Process files to organize them by type, first separating into text-based and image-based files.
     If the output directory already contains similar folders, reuse them.
+    Yields operation dicts so large batches need not be held in memory.
     """
-    operations = []
-
-    # Define extensions
-    image_extensions = ('.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff')
-    text_extensions = ('.txt', '.md', '.docx', '.doc', '.pdf', '.xls', '.xlsx', '.epub', '.mobi', '.azw', '.azw3')
-
-    existing_rel_dirs = _list_existing_relative_dirs(output_path)
+    existing_rel_dirs = set(_list_existing_relative_dirs(output_path))
+    batch_mapped = {}
+    # Paths in the loop are built by concatenation onto this prefix;
+    # os.path.join's argument handling is measurable at this call frequency
+    output_prefix = output_path if output_path.endswith(os.sep) else output_path + os.sep
 
     for file_path in file_paths:
+        # Split the path once; the tail doubles as the hidden-file check,
+        # the extension source and the destination file name
+        new_file_name = os.path.split(file_path)[1]
+
         # Exclude hidden files (additional safety)
-        if os.path.basename(file_path).startswith('.'):
+        if new_file_name.startswith('.'):
             continue
 
         # Get the file extension
-        ext = os.path.splitext(file_path)[1].lower()
-
-        # Check if it's an image file
-        if ext in image_extensions:
-            # Image-based files
-            top_folder = 'image_files'
-            # You can add subcategories here if needed
-            desired_rel = top_folder
-
-        elif ext in text_extensions:
-            # Text-based files
-            top_folder = 'text_files'
-            # Map extensions to subfolders
-            if ext in ('.txt', '.md'):
-                sub_folder = 'plain_text_files'
-            elif ext in ('.doc', '.docx'):
-                sub_folder = 'doc_files'
-            elif ext == '.pdf':
-                sub_folder = 'pdf_files'
-            elif ext in ('.xls', '.xlsx'):
-                sub_folder = 'xls_files'
-            elif ext in ('.epub', '.mobi', '.azw', '.azw3'):
-                sub_folder = 'ebooks'
-            else:
-                sub_folder = 'others'
-            desired_rel = os.path.join(top_folder, sub_folder)
+        ext = os.path.splitext(new_file_name)[1].lower()
 
+        # Resolve the desired folder from the dispatch tables
+        if ext in _IMAGE_EXTENSIONS:
+            desired_rel = 'image_files'
         else:
-            # Other types
-            desired_rel = 'others'
+            desired_rel = _TEXT_EXT_DIRS.get(ext, 'others')
 
-        # Map to best existing folder, if any
-        mapped_rel = find_best_existing_subdir(output_path, desired_rel, existing_rel_dirs)
+        # Map to best existing folder, if any. Resolve each desired folder
+        # once per batch; repeats skip the scan. Folders this batch
+        # introduces are only reused on exact match so fuzzy scoring cannot
+        # collapse distinct type buckets into each other.
+        mapped_rel = batch_mapped.get(desired_rel)
+        if mapped_rel is None:
+            mapped_rel = find_best_existing_subdir(output_path, desired_rel, existing_rel_dirs)
+            batch_mapped[desired_rel] = mapped_rel
 
         # Create directory path
-        dir_path = os.path.join(output_path, mapped_rel)
-        # Prepare new file path
-        new_file_name = os.path.basename(file_path)
-        new_file_path = os.path.join(dir_path, new_file_name)
+        dir_path = output_prefix + mapped_rel
+        # Prepare new file path (tail computed at the top of the loop)
+        new_file_path = dir_path + os.sep + new_file_name
         # Record the operation
-        operation = {
-            'source': file_path,
-            'destination': new_file_path,
-            'link_type': link_type,
-        }
-        operations.append(operation)
+        yield Operation(file_path, new_file_path, link_type)
+
+def preview_files_by_type(file_paths, output_path):
+    """Count type-mode destinations without building per-file operations.
+    Returns (per_folder, by_ext) dicts mapping relative folder / extension
+    to file counts — all a dry-run summary needs.
+    """
+    existing_rel_dirs = set(_list_existing_relative_dirs(output_path))
+    batch_mapped = {}
+    per_folder = defaultdict(int)
+    by_ext = defaultdict(int)
+    for file_path in file_paths:
+        tail = os.path.split(file_path)[1]
+        if tail.startswith('.'):
+            continue
+        ext = os.path.splitext(tail)[1].lower()
+        if ext in _IMAGE_EXTENSIONS:
+            desired_rel = 'image_files'
+        else:
+            desired_rel = _TEXT_EXT_DIRS.get(ext, 'others')
+        mapped_rel = batch_mapped.get(desired_rel)
+        if mapped_rel is None:
+            mapped_rel = find_best_existing_subdir(output_path, desired_rel, existing_rel_dirs)
+            batch_mapped[desired_rel] = mapped_rel
+        per_folder[mapped_rel] += 1
+        by_ext[ext] += 1
+    return per_folder, by_ext
 
-    return operations
 
 def compute_operations(data_list, new_path, renamed_files, processed_files, link_type: str = 'hardlink'):
     """Compute the file operations based on generated metadata.
     Align AI-suggested folder names with any existing subfolders in the target directory.
+    Yields operation dicts so large batches need not be held in memory.
     """
-    operations = []
-    existing_rel_dirs = _list_existing_relative_dirs(new_path)
+    existing_rel_dirs = set(_list_existing_relative_dirs(new_path))
+    name_counters = defaultdict(int)
+    # Paths in the loop are built by concatenation onto this prefix;
+    # os.path.join's argument handling is measurable at this call frequency
+    new_path_prefix = new_path if new_path.endswith(os.sep) else new_path + os.sep
     for data in data_list:
         file_path = data['file_path']
         if file_path in processed_files:
@@ -224,40 +470,106 @@ def compute_operations(data_list, new_path, renamed_files, processed_files, link
         # Prepare folder name and file name
         original_folder_name = data['foldername']
         mapped_folder_name = find_best_existing_subdir(new_path, original_folder_name, existing_rel_dirs)
-        new_file_name = data['filename'] + os.path.splitext(file_path)[1]
+        # Later files in this batch may map onto folders the batch introduces
+        existing_rel_dirs.add(mapped_folder_name)
+        ext = os.path.splitext(file_path)[1]
+        base_name = data['filename']
+        new_file_name = base_name + ext
 
         # Prepare new file path
-        dir_path = os.path.join(new_path, mapped_folder_name)
-        new_file_path = os.path.join(dir_path, new_file_name)
-
-        # Handle duplicates
-        counter = 1
-        original_new_file_name = new_file_name
+        dir_path = new_path_prefix + mapped_folder_name
+        dir_prefix = dir_path + os.sep
+        new_file_path = dir_prefix + new_file_name
+
+        # Handle duplicates: resume numbering from the last suffix used for
+        # this (folder, name) pair so K collisions cost O(1) each, not O(K)
+        counter_key = (dir_path, base_name)
+        counter = name_counters[counter_key]
         while new_file_path in renamed_files:
-            new_file_name = f"{data['filename']}_{counter}" + os.path.splitext(file_path)[1]
-            new_file_path = os.path.join(dir_path, new_file_name)
             counter += 1
+            new_file_name = f"{base_name}_{counter}{ext}"
+            new_file_path = dir_prefix + new_file_name
+        name_counters[counter_key] = counter
 
         # Record the operation
-        operation = {
-            'source': file_path,
-            'destination': new_file_path,
-            'link_type': link_type,
-            'folder_name': mapped_folder_name,
-            'original_folder_name': original_folder_name,
-            'new_file_name': new_file_name
-        }
-        operations.append(operation)
         renamed_files.add(new_file_path)
+        yield Operation(file_path, new_file_path, link_type,
+                        folder_name=mapped_folder_name,
+                        original_folder_name=original_folder_name,
+                        new_file_name=new_file_name)
+
+def _fast_copy(source, destination):
+    """Copy source to destination, preserving metadata like copy2.
+
+    Uses os.copy_file_range where available (Linux 4.5+) so the bytes move
+    in-kernel — and become a metadata-only reflink on Btrfs/XFS — instead of
+    round-tripping through a userspace buffer. Falls back to shutil.copy2
+    when the syscall is missing or unsupported by the filesystem.
+    """
+    if not hasattr(os, 'copy_file_range'):
+        shutil.copy2(source, destination)
+        return
+    try:
+        with open(source, 'rb') as src, open(destination, 'wb') as dst:
+            src_fd = src.fileno()
+            dst_fd = dst.fileno()
+            remaining = os.fstat(src_fd).st_size
+            while remaining > 0:
+                moved = os.copy_file_range(src_fd, dst_fd, remaining)
+                if moved == 0:
+                    break
+                remaining -= moved
+        shutil.copystat(source, destination)
+    except OSError:
+        # e.g. cross-device copy on an older kernel, or an fs that
+        # rejects copy_file_range; redo with the portable path
+        shutil.copy2(source, destination)
+
+
+# Known link strategies; anything else falls through to a copy
+_LINK_FUNCS = {'hardlink': os.link, 'symlink': os.symlink}
 
-    return operations  # Return the list of operations for display or further processing
 
 def execute_operations(operations, dry_run=False, silent=False, log_file=None):
     """Execute the file operations.
     Attempts hardlink/symlink first; on failure, falls back to copying the file (copy2).
+    The link/copy syscalls release the GIL and are independent, so they are
+    dispatched on a thread pool; progress updates and log writes stay on the
+    main thread, which keeps rich's Progress and the log file single-writer.
     """
-    import shutil
-    total_operations = len(operations)
+    total_operations = len(operations) if hasattr(operations, '__len__') else None
+
+    def _perform(operation):
+        """Perform a single operation and return its log message."""
+        source = operation.source
+        destination = operation.destination
+        link_type = operation.link_type
+
+        if dry_run:
+            message = f"Dry run: would create {link_type} from '{source}' to '{destination}'"
+        else:
+            link_func = _LINK_FUNCS.get(link_type)
+            try:
+                if link_func is not None:
+                    link_func(source, destination)
+                    message = f"Created {link_type} from '{source}' to '{destination}'"
+                else:
+                    # Unknown link_type -> copy
+                    _fast_copy(source, destination)
+                    message = f"Copied file from '{source}' to '{destination}'"
+            except Exception as e:
+                # Fallback to copying the file if linking fails
+                try:
+                    _fast_copy(source, destination)
+                    message = f"Link failed ({e}); copied file from '{source}' to '{destination}' instead"
+                except Exception as copy_err:
+                    message = f"Error saving file to '{destination}': {copy_err} (original link error: {e})"
+
+        # Add warning for unclassified operations
+        if operation.unclassified:
+            warn_line = f"WARNING: File copied without classification or renaming: '{source}' -> '{destination}'"
+            message = warn_line + "\n" + message
+        return message
 
     with Progress(
         TextColumn("[progress.description]{task.description}"),
@@ -266,47 +578,42 @@ def execute_operations(operations, dry_run=False, silent=False, log_file=None):
         transient=True
     ) as progress:
         task = progress.add_task("Organizing Files...", total=total_operations)
-        for operation in operations:
-            source = operation['source']
-            destination = operation['destination']
-            link_type = operation['link_type']
-            dir_path = os.path.dirname(destination)
 
+        # Open the log once for the whole batch instead of per message;
+        # line buffering keeps the log current if the run is interrupted
+        log_fh = open(log_file, 'a', buffering=1) if (silent and log_file) else None
+
+        def _report(messages):
+            for message in messages:
+                progress.advance(task)
+                # Silent mode handling
+                if silent:
+                    if log_fh:
+                        log_fh.write(message + '\n')
+                else:
+                    print(message)
+
+        try:
             if dry_run:
-                message = f"Dry run: would create {link_type} from '{source}' to '{destination}'"
-            else:
-                # Ensure the directory exists before performing the operation
-                os.makedirs(dir_path, exist_ok=True)
-
-                try:
-                    if link_type == 'hardlink':
-                        os.link(source, destination)
-                        message = f"Created {link_type} from '{source}' to '{destination}'"
-                    elif link_type == 'symlink':
-                        os.symlink(source, destination)
-                        message = f"Created {link_type} from '{source}' to '{destination}'"
-                    else:
-                        # Unknown link_type -> copy
-                        shutil.copy2(source, destination)
-                        message = f"Copied file from '{source}' to '{destination}'"
-                except Exception as e:
-                    # Fallback to copying the file if linking fails
-                    try:
-                        shutil.copy2(source, destination)
-                        message = f"Link failed ({e}); copied file from '{source}' to '{destination}' instead"
-                    except Exception as copy_err:
-                        message = f"Error saving file to '{destination}': {copy_err} (original link error: {e})"
-
-            # Add warning for unclassified operations
-            if operation.get('unclassified'):
-                warn_line = f"WARNING: File copied without classification or renaming: '{source}' -> '{destination}'"
-                message = warn_line + "\n" + message
-            progress.advance(task)
-
-            # Silent mode handling
-            if silent:
-                if log_file:
-                    with open(log_file, 'a') as f:
-                        f.write(message + '\n')
+                _report(map(_perform, operations))
             else:
-                print(message)
\ No newline at end of file
+                # The directory pre-pass below needs a second iteration, so
+                # materialize generators first (dry runs stay streaming)
+                if total_operations is None:
+                    operations = list(operations)
+                # Create all destination directories up front: makedirs is cheap,
+                # and doing it serially avoids racing threads on shared parents.
+                # Most operations land in a handful of folders, so dedup first;
+                # makedirs with exist_ok still stats the whole path every call.
+                created_dirs = set()
+                for operation in operations:
+                    dir_path = os.path.dirname(operation.destination)
+                    if dir_path not in created_dirs:
+                        os.makedirs(dir_path, exist_ok=True)
+                        created_dirs.add(dir_path)
+                max_workers = min(32, (os.cpu_count() or 1) * 4)
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    _report(executor.map(_perform, operations))
+        finally:
+            if log_fh:
+                log_fh.close()
\ No newline at end of file
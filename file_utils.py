@@ -1,6 +1,8 @@
 import os
 import re
 import shutil
+import functools
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from PIL import Image
 import pytesseract
 import fitz  # PyMuPDF
@@ -9,12 +11,20 @@ import pandas as pd  # Import pandas to read Excel and CSV files
 from pptx import Presentation  # Import Presentation for PPT files
 
 def read_text_file(file_path):
-    """Read text content from a text file."""
+    """Read text content from a text file.
+
+    Reads a single 4 KB block (the downstream prompt is capped at 3000
+    characters anyway) and rejects files whose first block contains NUL
+    bytes — binaries with a text extension would only feed garbage to the
+    model.
+    """
     max_chars = 3000  # Limit processing time
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as file:
-            text = file.read(max_chars)
-        return text
+        with open(file_path, 'rb') as file:
+            head = file.read(4096)
+        if b'\x00' in head:
+            return None  # binary data masquerading as text
+        return head.decode('utf-8', errors='ignore')[:max_chars]
     except Exception as e:
         print(f"Error reading text file {file_path}: {e}")
         return None
@@ -72,8 +82,10 @@ def read_ppt_file(file_path):
         print(f"Error reading PowerPoint file {file_path}: {e}")
         return None
 
-def read_file_data(file_path):
-    """Read content from a file based on its extension."""
+@functools.lru_cache(maxsize=4096)
+def _read_file_data_cached(file_path, mtime_ns, size):
+    """Dispatch on extension; mtime_ns/size are part of the cache key so a
+    modified file is re-read rather than served stale."""
     ext = os.path.splitext(file_path.lower())[1]
     if ext in ['.txt', '.md']:
         return read_text_file(file_path)
@@ -88,6 +100,22 @@ def read_file_data(file_path):
     else:
         return None  # Unsupported file type
 
+def read_file_data(file_path):
+    """Read content from a file based on its extension.
+
+    Results are memoized on (path, mtime, size) so repeated passes over the
+    same directory skip the extraction work; call
+    read_file_data.cache_clear() to drop the cache between runs.
+    """
+    try:
+        st = os.stat(file_path)
+        key = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        key = (0, 0)
+    return _read_file_data_cached(file_path, *key)
+
+read_file_data.cache_clear = _read_file_data_cached.cache_clear
+
 def display_directory_tree(path):
     """Display the directory tree in a format similar to the 'tree' command, including the full path."""
     def tree(dir_path, prefix=''):
@@ -105,25 +133,82 @@ def display_directory_tree(path):
     else:
         print(os.path.abspath(path))
 
-def collect_file_paths(base_path):
-    """Collect all file paths from the base directory or single file, excluding hidden files."""
+def collect_file_paths(base_path, stat_cache=None):
+    """Collect all file paths from the base directory or single file, excluding hidden files.
+
+    When a dict is passed as stat_cache it is filled with path -> stat_result
+    using the stats the walk already has, so later passes (the copy-size
+    preview, date-mode bucketing) don't need a fresh stat() per file.
+    """
     if os.path.isfile(base_path):
         # Exclude hidden files (dotfiles)
-        return [] if os.path.basename(base_path).startswith('.') else [base_path]
-    else:
-        file_paths = []
-        for root, _, files in os.walk(base_path):
-            for file in files:
-                if not file.startswith('.'):  # Exclude hidden files
-                    file_paths.append(os.path.join(root, file))
-        return file_paths
+        if os.path.basename(base_path).startswith('.'):
+            return []
+        if stat_cache is not None:
+            try:
+                stat_cache[base_path] = os.stat(base_path)
+            except OSError:
+                pass
+        return [base_path]
+    # Scan subdirectories in parallel: each readdir is latency-bound (worst
+    # on network mounts), so overlapping them across threads hides most of
+    # the walk time. Workers only scan; the main thread aggregates results.
+    def _scan_dir(dir_path):
+        files = []
+        subdirs = []
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    try:
+                        # Mirror os.walk's shape: recurse into real
+                        # directories only (hidden ones included), but
+                        # collect any entry that resolves to a regular file
+                        # — symlinked files count. Only hidden *files* are
+                        # excluded. The cached stat follows symlinks so it
+                        # describes the target's size/mtime.
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif entry.name[0] == '.':  # Exclude hidden files
+                            continue
+                        elif entry.is_file():
+                            files.append((entry.path, entry.stat()))
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        return files, subdirs
+
+    file_paths = []
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        pending = {executor.submit(_scan_dir, base_path)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirs = future.result()
+                for path, st in files:
+                    file_paths.append(path)
+                    if stat_cache is not None:
+                        stat_cache[path] = st
+                for subdir in subdirs:
+                    pending.add(executor.submit(_scan_dir, subdir))
+    return file_paths
+
+# Frozen sets give O(1) membership checks in separate_files_by_type,
+# versus a linear scan of a tuple per file.
+IMAGE_EXTENSIONS = frozenset(('.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff'))
+TEXT_EXTENSIONS = frozenset(('.txt', '.docx', '.doc', '.pdf', '.md', '.xls', '.xlsx', '.ppt', '.pptx', '.csv'))
 
 def separate_files_by_type(file_paths):
     """Separate files into images and text files based on their extensions."""
-    image_extensions = ('.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff')
-    text_extensions = ('.txt', '.docx', '.doc', '.pdf', '.md', '.xls', '.xlsx', '.ppt', '.pptx', '.csv')
-    image_files = [fp for fp in file_paths if os.path.splitext(fp.lower())[1] in image_extensions]
-    text_files = [fp for fp in file_paths if os.path.splitext(fp.lower())[1] in text_extensions]
+    image_files = []
+    text_files = []
+    splitext = os.path.splitext
+    for fp in file_paths:
+        ext = splitext(fp)[1].lower()
+        if ext in IMAGE_EXTENSIONS:
+            image_files.append(fp)
+        elif ext in TEXT_EXTENSIONS:
+            text_files.append(fp)
 
     return image_files, text_files  # Return only two values
 
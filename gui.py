@@ -4,22 +4,22 @@ Uses the standard library Tkinter to gather input interactively when available.
 """
 from __future__ import annotations
 
+import functools
 import os
 from typing import Optional, Dict, Any
 
 
+@functools.lru_cache(maxsize=1)
 def is_gui_available() -> bool:
     """Return True if a GUI can be rendered using Tkinter.
 
     We try to import tkinter and briefly instantiate a root window. On
     headless systems (e.g., no DISPLAY), this will fail and we return False.
+    The probe is expensive (Tk() startup can take tens of milliseconds), so
+    the result is cached for the lifetime of the process.
     """
-    try:
-        import tkinter as tk  # noqa: F401
-    except Exception:
-        return False
-
-    # On Unix-like systems, DISPLAY must be set
+    # On Unix-like systems DISPLAY must be set; check before touching
+    # tkinter at all so headless runs skip the import entirely
     if os.name != "nt":
         if not os.environ.get("DISPLAY") and not os.environ.get("WAYLAND_DISPLAY"):
             return False
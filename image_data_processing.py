@@ -1,6 +1,7 @@
 import re
 import os
 import time
+import functools
 from nltk.tokenize import word_tokenize
 from nltk.corpus import stopwords
 from nltk.stem import WordNetLemmatizer
@@ -8,8 +9,9 @@ from rich.progress import Progress, TextColumn, BarColumn, TimeElapsedColumn
 from data_processing_common import sanitize_filename  # Import sanitize_filename
 
 # Robust fallbacks for NLTK resources (works offline if corpora are missing)
+@functools.lru_cache(maxsize=1)
 def get_english_stopwords():
-    """Return a set of English stopwords.
+    """Return a set of English stopwords (computed once per process).
     Tries NLTK's stopwords; if unavailable, uses a built-in minimal set without attempting any downloads.
     """
     try:
@@ -45,58 +47,23 @@ def get_text_from_generator(generator):
         pass
     return response_text
 
-def process_single_image(image_path, image_inference, text_inference, silent=False, log_file=None):
-    """Process a single image file to generate metadata."""
-    start_time = time.time()
+# Words stripped from AI-generated filenames and folder names
+_UNWANTED_WORDS = set([
+    'the', 'and', 'based', 'generated', 'this', 'is', 'filename', 'file', 'image', 'picture', 'photo',
+    'folder', 'category', 'output', 'only', 'below', 'text', 'jpg', 'png', 'jpeg', 'gif', 'bmp', 'svg',
+    'logo', 'in', 'on', 'of', 'with', 'by', 'for', 'to', 'from', 'a', 'an', 'as', 'at', 'red', 'blue',
+    'green', 'color', 'colors', 'colored', 'text', 'graphic', 'graphics', 'main', 'subject', 'important',
+    'details', 'description', 'depicts', 'show', 'shows', 'display', 'illustrates', 'presents', 'features',
+    'provides', 'covers', 'includes', 'demonstrates', 'describes'
+])
 
-    # Create a Progress instance for this file
-    with Progress(
-        TextColumn("[progress.description]{task.description}"),
-        BarColumn(),
-        TimeElapsedColumn()
-    ) as progress:
-        task_id = progress.add_task(f"Processing {os.path.basename(image_path)}", total=1.0)
-        foldername, filename, description = generate_image_metadata(image_path, progress, task_id, image_inference, text_inference)
-    
-    end_time = time.time()
-    time_taken = end_time - start_time
-
-    message = f"File: {image_path}\nTime taken: {time_taken:.2f} seconds\nDescription: {description}\nFolder name: {foldername}\nGenerated filename: {filename}\n"
-    if silent:
-        if log_file:
-            with open(log_file, 'a') as f:
-                f.write(message + '\n')
-    else:
-        print(message)
-    return {
-        'file_path': image_path,
-        'foldername': foldername,
-        'filename': filename,
-        'description': description
-    }
+_LEMMATIZER = WordNetLemmatizer()
 
-def process_image_files(image_paths, image_inference, text_inference, silent=False, log_file=None):
-    """Process image files sequentially."""
-    data_list = []
-    for image_path in image_paths:
-        data = process_single_image(image_path, image_inference, text_inference, silent=silent, log_file=log_file)
-        data_list.append(data)
-    return data_list
+_DESCRIPTION_PROMPT = "Please provide a detailed description of this image, focusing on the main subject and any important details."
 
-def generate_image_metadata(image_path, progress, task_id, image_inference, text_inference):
-    """Generate description, folder name, and filename for an image file."""
 
-    # Total steps in processing an image
-    total_steps = 3
-
-    # Step 1: Generate description using image_inference
-    description_prompt = "Please provide a detailed description of this image, focusing on the main subject and any important details."
-    description_generator = image_inference._chat(description_prompt, image_path)
-    description = get_text_from_generator(description_generator).strip()
-    progress.update(task_id, advance=1 / total_steps)
-
-    # Step 2: Generate filename using text_inference
-    filename_prompt = f"""Based on the description below, generate a specific and descriptive filename for the image.
+def _filename_prompt(description):
+    return f"""Based on the description below, generate a specific and descriptive filename for the image.
 Limit the filename to a maximum of 3 words. Use nouns and avoid starting with verbs like 'depicts', 'shows', 'presents', etc.
 Do not include any data type words like 'image', 'jpg', 'png', etc. Use only letters and connect words with underscores.
 
@@ -111,14 +78,10 @@ Now generate the filename.
 Output only the filename, without any additional text.
 
 Filename:"""
-    filename_response = text_inference.create_completion(filename_prompt)
-    filename = filename_response['choices'][0]['text'].strip()
-    # Remove 'Filename:' prefix if present
-    filename = re.sub(r'^Filename:\s*', '', filename, flags=re.IGNORECASE).strip()
-    progress.update(task_id, advance=1 / total_steps)
 
-    # Step 3: Generate folder name from description using text_inference
-    foldername_prompt = f"""Based on the description below, generate a general category or theme that best represents the main subject of this image.
+
+def _foldername_prompt(description):
+    return f"""Based on the description below, generate a general category or theme that best represents the main subject of this image.
 This will be used as the folder name. Limit the category to a maximum of 2 words. Use nouns and avoid verbs.
 Do not include specific details, words from the filename, or any generic terms like 'untitled' or 'unknown'.
 
@@ -139,71 +102,178 @@ Now generate the category.
 Output only the category, without any additional text.
 
 Category:"""
-    foldername_response = text_inference.create_completion(foldername_prompt)
-    foldername = foldername_response['choices'][0]['text'].strip()
-    # Remove 'Category:' prefix if present
-    foldername = re.sub(r'^Category:\s*', '', foldername, flags=re.IGNORECASE).strip()
-    progress.update(task_id, advance=1 / total_steps)
 
-    # Remove any unwanted words and stopwords
-    unwanted_words = set([
-        'the', 'and', 'based', 'generated', 'this', 'is', 'filename', 'file', 'image', 'picture', 'photo',
-        'folder', 'category', 'output', 'only', 'below', 'text', 'jpg', 'png', 'jpeg', 'gif', 'bmp', 'svg',
-        'logo', 'in', 'on', 'of', 'with', 'by', 'for', 'to', 'from', 'a', 'an', 'as', 'at', 'red', 'blue',
-        'green', 'color', 'colors', 'colored', 'text', 'graphic', 'graphics', 'main', 'subject', 'important',
-        'details', 'description', 'depicts', 'show', 'shows', 'display', 'illustrates', 'presents', 'features',
-        'provides', 'covers', 'includes', 'demonstrates', 'describes'
-    ])
+
+def _strip_label(text, label):
+    """Remove a 'Label:' prefix the model sometimes echoes back."""
+    return re.sub(rf'^{label}:\s*', '', text.strip(), flags=re.IGNORECASE).strip()
+
+
+def _clean_ai_output(text, max_words, all_unwanted_words, lemmatizer):
+    """Clean and process the AI output down to joined keywords."""
+    # Remove file extensions and special characters
+    text = re.sub(r'\.\w{1,4}$', '', text)  # Remove file extensions like .jpg, .png
+    text = re.sub(r'[^\w\s]', ' ', text)  # Remove special characters
+    text = re.sub(r'\d+', '', text)  # Remove digits
+    text = text.strip()
+    # Split concatenated words (e.g., 'GoogleChrome' -> 'Google Chrome')
+    text = re.sub(r'([a-z])([A-Z])', r'\1 \2', text)
+    # Tokenize and lemmatize words
+    words = tokenize_words(text)
+    words = [word.lower() for word in words if word.isalpha()]
+    try:
+        words = [lemmatizer.lemmatize(word) for word in words]
+    except LookupError:
+        # If WordNet data is missing and cannot be downloaded, skip lemmatization
+        pass
+    # Remove unwanted words and duplicates
+    filtered_words = []
+    seen = set()
+    for word in words:
+        if word not in all_unwanted_words and word not in seen:
+            filtered_words.append(word)
+            seen.add(word)
+    # Limit to max words
+    filtered_words = filtered_words[:max_words]
+    return '_'.join(filtered_words)
+
+
+def _finalize_image_metadata(description, filename, foldername, image_path):
+    """Clean the raw AI outputs into a sanitized (foldername, filename, description)."""
     stop_words = get_english_stopwords()
-    all_unwanted_words = unwanted_words.union(stop_words)
-    lemmatizer = WordNetLemmatizer()
-
-    # Function to clean and process the AI output
-    def clean_ai_output(text, max_words):
-        # Remove file extensions and special characters
-        text = re.sub(r'\.\w{1,4}$', '', text)  # Remove file extensions like .jpg, .png
-        text = re.sub(r'[^\w\s]', ' ', text)  # Remove special characters
-        text = re.sub(r'\d+', '', text)  # Remove digits
-        text = text.strip()
-        # Split concatenated words (e.g., 'GoogleChrome' -> 'Google Chrome')
-        text = re.sub(r'([a-z])([A-Z])', r'\1 \2', text)
-        # Tokenize and lemmatize words
-        words = tokenize_words(text)
-        words = [word.lower() for word in words if word.isalpha()]
-        try:
-            words = [lemmatizer.lemmatize(word) for word in words]
-        except LookupError:
-            # If WordNet data is missing and cannot be downloaded, skip lemmatization
-            pass
-        # Remove unwanted words and duplicates
-        filtered_words = []
-        seen = set()
-        for word in words:
-            if word not in all_unwanted_words and word not in seen:
-                filtered_words.append(word)
-                seen.add(word)
-        # Limit to max words
-        filtered_words = filtered_words[:max_words]
-        return '_'.join(filtered_words)
+    all_unwanted_words = _UNWANTED_WORDS.union(stop_words)
+    lemmatizer = _LEMMATIZER
 
     # Process filename
-    filename = clean_ai_output(filename, max_words=3)
+    filename = _clean_ai_output(filename, 3, all_unwanted_words, lemmatizer)
     if not filename or filename.lower() in ('untitled', ''):
         # Use keywords from the description
-        filename = clean_ai_output(description, max_words=3)
+        filename = _clean_ai_output(description, 3, all_unwanted_words, lemmatizer)
     if not filename:
         filename = 'image_' + os.path.splitext(os.path.basename(image_path))[0]
 
     sanitized_filename = sanitize_filename(filename, max_words=3)
 
     # Process foldername
-    foldername = clean_ai_output(foldername, max_words=2)
+    foldername = _clean_ai_output(foldername, 2, all_unwanted_words, lemmatizer)
     if not foldername or foldername.lower() in ('untitled', ''):
         # Attempt to extract keywords from the description
-        foldername = clean_ai_output(description, max_words=2)
+        foldername = _clean_ai_output(description, 2, all_unwanted_words, lemmatizer)
         if not foldername:
             foldername = 'images'
 
     sanitized_foldername = sanitize_filename(foldername, max_words=2)
 
     return sanitized_foldername, sanitized_filename, description
+
+
+def _format_result(image_path, foldername, filename, description, time_taken, silent, log_file):
+    message = f"File: {image_path}\nTime taken: {time_taken:.2f} seconds\nDescription: {description}\nFolder name: {foldername}\nGenerated filename: {filename}\n"
+    if silent:
+        if log_file:
+            with open(log_file, 'a') as f:
+                f.write(message + '\n')
+    else:
+        print(message)
+    return {
+        'file_path': image_path,
+        'foldername': foldername,
+        'filename': filename,
+        'description': description
+    }
+
+
+def process_single_image(image_path, image_inference, text_inference, silent=False, log_file=None):
+    """Process a single image file to generate metadata."""
+    start_time = time.time()
+
+    # Create a Progress instance for this file
+    with Progress(
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        TimeElapsedColumn()
+    ) as progress:
+        task_id = progress.add_task(f"Processing {os.path.basename(image_path)}", total=1.0)
+        foldername, filename, description = generate_image_metadata(image_path, progress, task_id, image_inference, text_inference)
+
+    time_taken = time.time() - start_time
+    return _format_result(image_path, foldername, filename, description, time_taken, silent, log_file)
+
+
+def process_image_files(image_paths, image_inference, text_inference, silent=False, log_file=None):
+    """Process image files, batching the Ollama calls across files when the
+    inference clients support it; otherwise falls back to sequential
+    per-file processing."""
+    if (len(image_paths) <= 1
+            or not hasattr(image_inference, 'analyze_images')
+            or not hasattr(text_inference, 'create_completions')):
+        data_list = []
+        for image_path in image_paths:
+            data = process_single_image(image_path, image_inference, text_inference, silent=silent, log_file=log_file)
+            data_list.append(data)
+        return data_list
+    return _process_image_files_batched(image_paths, image_inference, text_inference, silent=silent, log_file=log_file)
+
+
+def _process_image_files_batched(image_paths, image_inference, text_inference, silent=False, log_file=None):
+    """Run the three metadata stages as concurrent request batches.
+    Each stage depends on the previous one's output, but within a stage the
+    per-file requests are independent, so they are dispatched together and
+    the Ollama server can overlap/batch the forward passes."""
+    start_time = time.time()
+
+    with Progress(
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        TimeElapsedColumn()
+    ) as progress:
+        task_id = progress.add_task(f"Processing {len(image_paths)} image files", total=3.0)
+
+        # Stage 1: Generate descriptions with the vision model
+        descriptions = image_inference.analyze_images(
+            [(_DESCRIPTION_PROMPT, image_path) for image_path in image_paths])
+        descriptions = [d.strip() for d in descriptions]
+        progress.update(task_id, advance=1.0)
+
+        # Stage 2: Generate filenames with the text model
+        responses = text_inference.create_completions([_filename_prompt(d) for d in descriptions])
+        filenames = [_strip_label(r['choices'][0]['text'], 'Filename') for r in responses]
+        progress.update(task_id, advance=1.0)
+
+        # Stage 3: Generate folder names with the text model
+        responses = text_inference.create_completions([_foldername_prompt(d) for d in descriptions])
+        foldernames = [_strip_label(r['choices'][0]['text'], 'Category') for r in responses]
+        progress.update(task_id, advance=1.0)
+
+    # Average per-file time; the batch runs the files together
+    time_taken = (time.time() - start_time) / len(image_paths)
+
+    data_list = []
+    for image_path, description, filename, foldername in zip(image_paths, descriptions, filenames, foldernames):
+        foldername, filename, description = _finalize_image_metadata(description, filename, foldername, image_path)
+        data_list.append(_format_result(image_path, foldername, filename, description, time_taken, silent, log_file))
+    return data_list
+
+
+def generate_image_metadata(image_path, progress, task_id, image_inference, text_inference):
+    """Generate description, folder name, and filename for an image file."""
+
+    # Total steps in processing an image
+    total_steps = 3
+
+    # Step 1: Generate description using image_inference
+    description_generator = image_inference._chat(_DESCRIPTION_PROMPT, image_path)
+    description = get_text_from_generator(description_generator).strip()
+    progress.update(task_id, advance=1 / total_steps)
+
+    # Step 2: Generate filename using text_inference
+    filename_response = text_inference.create_completion(_filename_prompt(description))
+    filename = _strip_label(filename_response['choices'][0]['text'], 'Filename')
+    progress.update(task_id, advance=1 / total_steps)
+
+    # Step 3: Generate folder name from description using text_inference
+    foldername_response = text_inference.create_completion(_foldername_prompt(description))
+    foldername = _strip_label(foldername_response['choices'][0]['text'], 'Category')
+    progress.update(task_id, advance=1 / total_steps)
+
+    return _finalize_image_metadata(description, filename, foldername, image_path)
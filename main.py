@@ -2,6 +2,8 @@ import os
 import time
 import argparse
 import json
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
 from file_utils import (
@@ -12,10 +14,13 @@ from file_utils import (
 )
 
 from data_processing_common import (
+    Operation,
     compute_operations,
     execute_operations,
     process_files_by_date,
     process_files_by_type,
+    preview_files_by_date,
+    preview_files_by_type,
 )
 
 from text_data_processing import (
@@ -71,6 +76,14 @@ def ensure_nltk_data():
                 # Ignore any downloader errors; downstream code has fallbacks.
                 pass
 
+def _prepare_text_tuple(file_path):
+    """Read one text file for content mode; returns (path, content-or-None).
+
+    Module-level so ProcessPoolExecutor can pickle it; workers run the
+    CPU/IO-heavy extraction (PDF parsing, spreadsheet loading) in parallel.
+    """
+    return file_path, read_file_data(file_path)
+
 # Initialize models
 image_inference = None
 text_inference = None
@@ -92,6 +105,11 @@ def initialize_models(image_model: str | None = None, text_model: str | None = N
 
             # Initialize the text inference model (wrapper over Ollama text model)
             text_inference = OllamaTextInference(model=text_model, base_url=base_url)
+
+            # Pre-load both models server-side so the first batch of real
+            # requests doesn't serialize behind the model load
+            image_inference.warm_up()
+            text_inference.warm_up()
         print("**----------------------------------------------**")
         print("**       Ollama vision model initialized        **")
         print("**       Ollama text model initialized          **")
@@ -101,7 +119,7 @@ def simulate_directory_tree(operations, base_path):
     """Simulate the directory tree based on the proposed operations."""
     tree = {}
     for op in operations:
-        rel_path = os.path.relpath(op['destination'], base_path)
+        rel_path = os.path.relpath(op.destination, base_path)
         parts = rel_path.split(os.sep)
         current_level = tree
         for part in parts:
@@ -110,14 +128,28 @@ def simulate_directory_tree(operations, base_path):
             current_level = current_level[part]
     return tree
 
-def print_simulated_tree(tree, prefix=''):
-    """Print the simulated directory tree."""
-    pointers = ['├── '] * (len(tree) - 1) + ['└── '] if tree else []
-    for pointer, key in zip(pointers, tree):
-        print(prefix + pointer + key)
-        if tree[key]:  # If there are subdirectories or files
+def render_simulated_tree(tree):
+    """Render the simulated directory tree as a single string.
+
+    Walks the nested dict with an explicit stack (no recursion-depth limit)
+    and joins all lines once, so the caller can emit the whole tree with one
+    write instead of a print per entry.
+    """
+    def entries(level, prefix):
+        items = list(level.items())
+        last = len(items) - 1
+        return [(name, sub, prefix, '├── ' if i < last else '└── ')
+                for i, (name, sub) in enumerate(items)]
+
+    lines = []
+    stack = list(reversed(entries(tree, '')))
+    while stack:
+        name, sub, prefix, pointer = stack.pop()
+        lines.append(prefix + pointer + name)
+        if sub:  # If there are subdirectories or files
             extension = '│   ' if pointer == '├── ' else '    '
-            print_simulated_tree(tree[key], prefix + extension)
+            stack.extend(reversed(entries(sub, prefix + extension)))
+    return '\n'.join(lines)
 
 def get_yes_no(prompt):
     """Prompt the user for a yes/no response."""
@@ -203,33 +235,52 @@ def make_log_file(suggested_dir: str | None, suggested_file: str | None):
     return log_file
 
 
-def print_and_log(message: str, silent_mode: bool, log_file: str | None):
+def print_and_log(message: str, silent_mode: bool, log_file):
+    """Write message to the log and echo it unless silent.
+
+    log_file may be an open file handle (preferred: one open() for the whole
+    run instead of an open/write/close triple per message) or a path, which
+    is opened per call.
+    """
     if log_file:
         try:
-            with open(log_file, 'a', encoding='utf-8') as f:
-                f.write(message + '\n')
+            if hasattr(log_file, 'write'):
+                log_file.write(message + '\n')
+            else:
+                with open(log_file, 'a', encoding='utf-8') as f:
+                    f.write(message + '\n')
         except Exception:
             pass
     if not silent_mode:
         print(message)
 
 
-def summarize_preview(operations, output_path, link_type: str):
+def summarize_preview(operations, output_path, link_type: str, stat_cache=None):
     # Count files per destination folder and by extension; estimate disk usage for copy
-    per_folder = {}
-    by_ext = {}
+    per_folder = defaultdict(int)
+    by_ext = defaultdict(int)
     total_size = 0
+    stat_cache = stat_cache or {}
+    is_copy = link_type == 'copy'
+    # hoist attribute lookups out of the per-operation loop
+    _relpath = os.path.relpath
+    _dirname = os.path.dirname
+    _splitext = os.path.splitext
+    _get_stat = stat_cache.get
     for op in operations:
-        dest = op['destination']
-        rel = os.path.relpath(os.path.dirname(dest), output_path)
-        per_folder[rel] = per_folder.get(rel, 0) + 1
-        ext = os.path.splitext(op['source'])[1].lower()
-        by_ext[ext] = by_ext.get(ext, 0) + 1
-        try:
-            if link_type == 'copy':
-                total_size += os.path.getsize(op['source'])
-        except Exception:
-            pass
+        source = op.source
+        per_folder[_relpath(_dirname(op.destination), output_path)] += 1
+        by_ext[_splitext(source)[1].lower()] += 1
+        if is_copy:
+            st = _get_stat(source)
+            if st is not None:
+                total_size += st.st_size
+            else:
+                # Not seen during collection (e.g. unclassified pass); stat once
+                try:
+                    total_size += os.path.getsize(source)
+                except Exception:
+                    pass
     return per_folder, by_ext, total_size
 
 
@@ -281,230 +332,294 @@ def main():
     image_model = args.model_image or cfg.get('model_image') or "llava:7b"
     ollama_url = args.ollama_url or cfg.get('ollama_url')
 
-    # Logging setup (per-run)
-    log_file = make_log_file(args.log_dir, args.log_file)
-    print_and_log("-" * 50, silent_mode, log_file)
-    print_and_log("Local File Organizer (Ollama) starting...", silent_mode, log_file)
-    print_and_log(f"Silent mode: {'ON' if silent_mode else 'OFF'} | Dry run: {'ON' if dry_run else 'OFF'} | Link: {link_type}", silent_mode, log_file)
-    print_and_log(f"Models => text: {text_model}, image: {image_model} | Ollama: {ollama_url or 'default'}", silent_mode, log_file)
+    # Resolve the remaining CLI/config fallbacks once, before the loops,
+    # so the mode-selection loop reads plain locals
+    configured_mode = args.mode or cfg.get('mode')
+    configured_input_path = args.input_path or cfg.get('input_path')
+    configured_output_path = args.output_path or cfg.get('output_path')
 
-    while True:
-        # Paths configuration
-        if not silent_mode:
-            print("-" * 50)
+    # Logging setup (per-run): open the log once and reuse the handle so
+    # each message is a buffered write instead of an open/write/close triple
+    log_file = make_log_file(args.log_dir, args.log_file)
+    try:
+        log_fh = open(log_file, 'a', buffering=1 << 16, encoding='utf-8')
+    except Exception:
+        log_fh = None
+    log = log_fh if log_fh is not None else log_file
+    print_and_log("-" * 50, silent_mode, log)
+    print_and_log("Local File Organizer (Ollama) starting...", silent_mode, log)
+    print_and_log(f"Silent mode: {'ON' if silent_mode else 'OFF'} | Dry run: {'ON' if dry_run else 'OFF'} | Link: {link_type}", silent_mode, log)
+    print_and_log(f"Models => text: {text_model}, image: {image_model} | Ollama: {ollama_url or 'default'}", silent_mode, log)
 
-        # Get input and output paths once per directory (CLI first, else prompt)
-        input_path = args.input_path or cfg.get('input_path')
-        if not input_path:
+    try:
+        while True:
+            # Paths configuration
             if not silent_mode:
                 print("-" * 50)
-            input_path = input("Enter the path of the directory you want to organize: ").strip()
-        while not os.path.exists(input_path):
-            message = f"Input path {input_path} does not exist. Please enter a valid path."
-            print_and_log(message, silent_mode, log_file)
-            # If provided via CLI/config and invalid, abort to avoid infinite loop
-            if args.input_path or cfg.get('input_path'):
-                return
-            input_path = input("Enter the path of the directory you want to organize: ").strip()
-
-        # Confirm successful input path
-        message = f"Input path successfully set: {input_path}"
-        print_and_log(message, silent_mode, log_file)
-        if not silent_mode:
-            print("-" * 50)
-
-        # Determine output path: CLI/config or default under input
-        output_path = args.output_path or cfg.get('output_path')
-        if not output_path:
-            # Create 'organized_folder' inside the input directory (or alongside the input file)
-            if os.path.isdir(input_path):
-                output_path = os.path.join(input_path, 'organized_folder')
-            else:
-                output_path = os.path.join(os.path.dirname(input_path), 'organized_folder')
-        message = f"Output path successfully set to: {output_path}"
-        print_and_log(message, silent_mode, log_file)
-        if not silent_mode:
-            print("-" * 50)
-
-        # Start processing files
-        start_time = time.time()
-        file_paths = collect_file_paths(input_path)
-        end_time = time.time()
-
-        message = f"Time taken to load file paths: {end_time - start_time:.2f} seconds"
-        print_and_log(message, silent_mode, log_file)
-        if not silent_mode:
-            print("-" * 50)
-            print("Directory tree before organizing:")
-            display_directory_tree(input_path)
-            print("*" * 50)
-
-        # Loop for selecting sorting methods
-        while True:
-            mode = args.mode or cfg.get('mode') or get_mode_selection()
 
-            if mode == 'content':
-                # Proceed with content mode
-                # Initialize models once
+            # Get input and output paths once per directory (CLI first, else prompt)
+            input_path = configured_input_path
+            if not input_path:
                 if not silent_mode:
-                    print("Checking if the model is already downloaded. If not, downloading it now.")
-                initialize_models(image_model=image_model, text_model=text_model, base_url=ollama_url)
-
-                if not silent_mode:
-                    print("*" * 50)
-                    print("The file upload was successful. Processing may take a few minutes.")
-                    print("*" * 50)
-
-
-                # Separate files by type
-                image_files, text_files = separate_files_by_type(file_paths)
-
-                # Prepare text tuples for processing
-                text_tuples = []
-                for fp in text_files:
-                    # Use read_file_data to read the file content
-                    text_content = read_file_data(fp)
-                    if text_content is None:
-                        message = f"Unsupported or unreadable text file format: {fp}"
-                        if silent_mode:
-                            with open(log_file, 'a') as f:
-                                f.write(message + '\n')
-                        else:
-                            print(message)
-                        continue  # Skip unsupported or unreadable files
-                    text_tuples.append((fp, text_content))
-
-                # Process files sequentially
-                data_images = process_image_files(image_files, image_inference, text_inference, silent=silent_mode, log_file=log_file)
-                data_texts = process_text_files(text_tuples, text_inference, silent=silent_mode, log_file=log_file)
-
-                # Prepare for copying and renaming
-                renamed_files = set()
-                processed_files = set()
-
-                # Combine all data
-                all_data = data_images + data_texts
-
-                # Compute the operations
-                operations = compute_operations(
-                    all_data,
-                    output_path,
-                    renamed_files,
-                    processed_files,
-                    link_type=link_type
-                )
-
-            elif mode == 'date':
-                # Process files by date
-                operations = process_files_by_date(file_paths, output_path, dry_run=dry_run, silent=silent_mode, log_file=log_file, link_type=link_type)
-            elif mode == 'type':
-                # Process files by type
-                operations = process_files_by_type(file_paths, output_path, dry_run=dry_run, silent=silent_mode, log_file=log_file, link_type=link_type)
-            elif mode == 'test':
-                # Simulate AI activity but organize strictly by type without AI
-                if not silent_mode:
-                    print("Checking if the model is already downloaded. If not, downloading it now.")
-                    print("**----------------------------------------------**")
-                    print("**     Simulated vision model initialized      **")
-                    print("**     Simulated text model initialized        **")
-                    print("**----------------------------------------------**")
-                    print("*" * 50)
-                    print("The file upload was successful. Processing may take a few minutes.")
-                    print("*" * 50)
-                operations = process_files_by_type(file_paths, output_path, dry_run=dry_run, silent=silent_mode, log_file=log_file, link_type=link_type)
-            else:
-                print("Invalid mode selected.")
-                return
-
-            # Add operations to copy any unprocessed, non-hidden files into an 'unclassified' folder
-            try:
-                all_non_hidden = [fp for fp in file_paths if not os.path.basename(fp).startswith('.')]
-                processed_sources = {op['source'] for op in operations}
-                unprocessed_files = [fp for fp in all_non_hidden if fp not in processed_sources]
-                if unprocessed_files:
-                    unclassified_dir = os.path.join(output_path, 'unclassified')
-                    for fp in unprocessed_files:
-                        dest = os.path.join(unclassified_dir, os.path.basename(fp))
-                        operations.append({
-                            'source': fp,
-                            'destination': dest,
-                            'link_type': 'copy',  # always copy as-is per requirement
-                            'unclassified': True
-                        })
-                        warn_msg = f"WARNING: File '{fp}' will be copied as-is to '{unclassified_dir}' without classification or renaming."
-                        print_and_log(warn_msg, silent_mode, log_file)
-            except Exception as _e:
-                # Do not fail the run due to unclassified handling
-                print_and_log(f"Note: Skipped adding unclassified operations due to: {_e}", silent_mode, log_file)
-
-            # Simulate and display the proposed directory tree
-            print_and_log("-" * 50, silent_mode, log_file)
-            print_and_log("Proposed directory structure:", silent_mode, log_file)
-            print_and_log(os.path.abspath(output_path), silent_mode, log_file)
-            simulated_tree = simulate_directory_tree(operations, output_path)
+                    print("-" * 50)
+                input_path = input("Enter the path of the directory you want to organize: ").strip()
+            while not os.path.exists(input_path):
+                message = f"Input path {input_path} does not exist. Please enter a valid path."
+                print_and_log(message, silent_mode, log)
+                # If provided via CLI/config and invalid, abort to avoid infinite loop
+                if configured_input_path:
+                    return
+                input_path = input("Enter the path of the directory you want to organize: ").strip()
+
+            # Confirm successful input path
+            message = f"Input path successfully set: {input_path}"
+            print_and_log(message, silent_mode, log)
             if not silent_mode:
-                print_simulated_tree(simulated_tree)
-            # Enhanced preview summary
-            per_folder, by_ext, total_size = summarize_preview(operations, output_path, link_type)
-            print_and_log("Summary:", silent_mode, log_file)
-            print_and_log(f"  Total operations: {len(operations)}", silent_mode, log_file)
-            print_and_log(f"  Folders to create: {len(per_folder)}", silent_mode, log_file)
-            print_and_log("  Files per folder:", silent_mode, log_file)
-            for folder, count in sorted(per_folder.items()):
-                print_and_log(f"    {folder} : {count}", silent_mode, log_file)
-            print_and_log("  Files by type:", silent_mode, log_file)
-            for ext, count in sorted(by_ext.items()):
-                print_and_log(f"    {ext or '[no ext]'} : {count}", silent_mode, log_file)
-            if link_type == 'copy':
-                print_and_log(f"  Estimated disk usage if copying: {total_size} bytes", silent_mode, log_file)
-            print_and_log("-" * 50, silent_mode, log_file)
-
-            # Proceed depending on dry_run and interactive/CLI mode
-            if dry_run:
-                print_and_log("Dry run mode: no changes were made.", silent_mode, log_file)
-                break
+                print("-" * 50)
 
-            # Determine proceed behavior
-            if args.mode or cfg.get('mode'):
-                proceed = True  # non-interactive run proceeds automatically
-            else:
-                proceed = get_yes_no("Would you like to proceed with these changes? (yes/no): ")
-
-            if proceed:
-                # Create the output directory now
-                os.makedirs(output_path, exist_ok=True)
-
-                # Perform the actual file operations
-                message = "Performing file operations..."
-                print_and_log(message, silent_mode, log_file)
-                execute_operations(
-                    operations,
-                    dry_run=False,
-                    silent=silent_mode,
-                    log_file=log_file
-                )
-
-                message = "The files have been organized successfully."
-                print_and_log("-" * 50, silent_mode, log_file)
-                print_and_log(message, silent_mode, log_file)
-                print_and_log("-" * 50, silent_mode, log_file)
-                break  # Exit the sorting method loop after successful operation
-            else:
-                # Ask if the user wants to try another sorting method
-                another_sort = get_yes_no("Would you like to choose another sorting method? (yes/no): ")
-                if another_sort:
-                    continue  # Loop back to mode selection
+            # Determine output path: CLI/config or default under input
+            output_path = configured_output_path
+            if not output_path:
+                # Create 'organized_folder' inside the input directory (or alongside the input file)
+                if os.path.isdir(input_path):
+                    output_path = os.path.join(input_path, 'organized_folder')
                 else:
-                    print("Operation canceled by the user.")
-                    break  # Exit the sorting method loop
+                    output_path = os.path.join(os.path.dirname(input_path), 'organized_folder')
+            message = f"Output path successfully set to: {output_path}"
+            print_and_log(message, silent_mode, log)
+            if not silent_mode:
+                print("-" * 50)
 
-        # Ask if the user wants to organize another directory (interactive only)
-        if args.input_path or args.mode:
-            break  # Non-interactive run: process once and exit
-        another_directory = get_yes_no("Would you like to organize another directory? (yes/no): ")
-        if not another_directory:
-            break  # Exit the main loop
+            # Start processing files; drop any cached content from a previous pass
+            read_file_data.cache_clear()
+            start_time = time.time()
+            stat_cache = {}
+            file_paths = collect_file_paths(input_path, stat_cache=stat_cache)
+            end_time = time.time()
 
+            message = f"Time taken to load file paths: {end_time - start_time:.2f} seconds"
+            print_and_log(message, silent_mode, log)
+            if not silent_mode:
+                print("-" * 50)
+                print("Directory tree before organizing:")
+                display_directory_tree(input_path)
+                print("*" * 50)
+
+            # Loop for selecting sorting methods
+            while True:
+                mode = configured_mode or get_mode_selection()
+
+                # In silent dry runs of the deterministic modes only the
+                # summary counts are shown, so skip building per-file
+                # operations (and the tree) entirely
+                preview_counts = None
+                if dry_run and silent_mode and mode in ('date', 'type', 'test'):
+                    if mode == 'date':
+                        preview_counts = preview_files_by_date(file_paths, output_path, stat_cache=stat_cache)
+                    else:
+                        preview_counts = preview_files_by_type(file_paths, output_path)
+                    operations = []
+                elif mode == 'content':
+                    # Proceed with content mode
+                    # Initialize models once
+                    if not silent_mode:
+                        print("Checking if the model is already downloaded. If not, downloading it now.")
+                    initialize_models(image_model=image_model, text_model=text_model, base_url=ollama_url)
+
+                    if not silent_mode:
+                        print("*" * 50)
+                        print("The file upload was successful. Processing may take a few minutes.")
+                        print("*" * 50)
+
+
+                    # Separate files by type
+                    image_files, text_files = separate_files_by_type(file_paths)
+
+                    # Prepare text tuples for processing. Extraction (PDF
+                    # parsing, spreadsheet loading) is CPU-bound, so larger
+                    # batches fan out across worker processes; small batches
+                    # stay sequential to avoid the pool start-up cost.
+                    if len(text_files) > 4:
+                        with ProcessPoolExecutor(max_workers=os.cpu_count(),
+                                                 initializer=ensure_nltk_data) as executor:
+                            prepared = list(executor.map(_prepare_text_tuple, text_files))
+                    else:
+                        prepared = [_prepare_text_tuple(fp) for fp in text_files]
+                    text_tuples = []
+                    for fp, text_content in prepared:
+                        if text_content is None:
+                            message = f"Unsupported or unreadable text file format: {fp}"
+                            print_and_log(message, silent_mode, log)
+                            continue  # Skip unsupported or unreadable files
+                        text_tuples.append((fp, text_content))
+
+                    # Process files sequentially
+                    if log_fh is not None:
+                        log_fh.flush()
+                    data_images = process_image_files(image_files, image_inference, text_inference, silent=silent_mode, log_file=log_file)
+                    data_texts = process_text_files(text_tuples, text_inference, silent=silent_mode, log_file=log_file)
+
+                    # Prepare for copying and renaming
+                    renamed_files = set()
+                    processed_files = set()
+
+                    # Combine all data
+                    all_data = data_images + data_texts
+
+                    # Compute the operations (materialized: main makes several
+                    # passes for the preview and unclassified handling)
+                    operations = list(compute_operations(
+                        all_data,
+                        output_path,
+                        renamed_files,
+                        processed_files,
+                        link_type=link_type
+                    ))
+
+                elif mode == 'date':
+                    # Process files by date
+                    if log_fh is not None:
+                        log_fh.flush()
+                    operations = list(process_files_by_date(file_paths, output_path, dry_run=dry_run, silent=silent_mode, log_file=log_file, link_type=link_type, stat_cache=stat_cache))
+                elif mode == 'type':
+                    # Process files by type
+                    if log_fh is not None:
+                        log_fh.flush()
+                    operations = list(process_files_by_type(file_paths, output_path, dry_run=dry_run, silent=silent_mode, log_file=log_file, link_type=link_type))
+                elif mode == 'test':
+                    # Simulate AI activity but organize strictly by type without AI
+                    if not silent_mode:
+                        print("Checking if the model is already downloaded. If not, downloading it now.")
+                        print("**----------------------------------------------**")
+                        print("**     Simulated vision model initialized      **")
+                        print("**     Simulated text model initialized        **")
+                        print("**----------------------------------------------**")
+                        print("*" * 50)
+                        print("The file upload was successful. Processing may take a few minutes.")
+                        print("*" * 50)
+                    if log_fh is not None:
+                        log_fh.flush()
+                    operations = list(process_files_by_type(file_paths, output_path, dry_run=dry_run, silent=silent_mode, log_file=log_file, link_type=link_type))
+                else:
+                    print("Invalid mode selected.")
+                    return
+
+                # Add operations to copy any unprocessed files into an 'unclassified'
+                # folder (collect_file_paths already excluded hidden files).
+                # The counting-only preview covers every file, so no diff is
+                # needed there.
+                try:
+                    if preview_counts is not None:
+                        unprocessed_files = []
+                    else:
+                        processed_sources = {op.source for op in operations}
+                        unprocessed_files = [fp for fp in file_paths if fp not in processed_sources]
+                    if unprocessed_files:
+                        unclassified_dir = os.path.join(output_path, 'unclassified')
+                        # Destinations share one prefix; concatenation beats
+                        # re-running os.path.join's parsing per file
+                        unclassified_prefix = unclassified_dir + os.sep
+                        _basename = os.path.basename
+                        _append = operations.append
+                        for fp in unprocessed_files:
+                            # always copy as-is per requirement
+                            _append(Operation(fp, unclassified_prefix + _basename(fp),
+                                              'copy', unclassified=True))
+                        # One aggregated warning instead of a log write per file
+                        warn_msg = '\n'.join(
+                            [f"WARNING: {len(unprocessed_files)} file(s) will be copied as-is to '{unclassified_dir}' without classification or renaming:"]
+                            + [f"  {fp}" for fp in unprocessed_files])
+                        print_and_log(warn_msg, silent_mode, log)
+                except Exception as _e:
+                    # Do not fail the run due to unclassified handling
+                    print_and_log(f"Note: Skipped adding unclassified operations due to: {_e}", silent_mode, log)
+
+                # Simulate and display the proposed directory tree
+                print_and_log("-" * 50, silent_mode, log)
+                if preview_counts is not None:
+                    # Counting-only preview: folder/extension tallies, no tree
+                    per_folder, by_ext = preview_counts
+                    total_operations = sum(per_folder.values())
+                    total_size = sum(st.st_size for st in stat_cache.values()) if link_type == 'copy' else 0
+                else:
+                    print_and_log("Proposed directory structure:", silent_mode, log)
+                    print_and_log(os.path.abspath(output_path), silent_mode, log)
+                    simulated_tree = simulate_directory_tree(operations, output_path)
+                    tree_text = render_simulated_tree(simulated_tree)
+                    if tree_text:
+                        print_and_log(tree_text, silent_mode, log)
+                    # Enhanced preview summary
+                    per_folder, by_ext, total_size = summarize_preview(operations, output_path, link_type, stat_cache=stat_cache)
+                    total_operations = len(operations)
+                print_and_log("Summary:", silent_mode, log)
+                print_and_log(f"  Total operations: {total_operations}", silent_mode, log)
+                print_and_log(f"  Folders to create: {len(per_folder)}", silent_mode, log)
+                print_and_log("  Files per folder:", silent_mode, log)
+                for folder, count in sorted(per_folder.items()):
+                    print_and_log(f"    {folder} : {count}", silent_mode, log)
+                print_and_log("  Files by type:", silent_mode, log)
+                for ext, count in sorted(by_ext.items()):
+                    print_and_log(f"    {ext or '[no ext]'} : {count}", silent_mode, log)
+                if link_type == 'copy':
+                    print_and_log(f"  Estimated disk usage if copying: {total_size} bytes", silent_mode, log)
+                print_and_log("-" * 50, silent_mode, log)
+
+                # Proceed depending on dry_run and interactive/CLI mode
+                if dry_run:
+                    print_and_log("Dry run mode: no changes were made.", silent_mode, log)
+                    break
+
+                # Determine proceed behavior
+                if configured_mode:
+                    proceed = True  # non-interactive run proceeds automatically
+                else:
+                    proceed = get_yes_no("Would you like to proceed with these changes? (yes/no): ")
+
+                if proceed:
+                    # Create the output directory now
+                    os.makedirs(output_path, exist_ok=True)
+
+                    # Perform the actual file operations
+                    message = "Performing file operations..."
+                    print_and_log(message, silent_mode, log)
+                    if log_fh is not None:
+                        log_fh.flush()
+                    execute_operations(
+                        operations,
+                        dry_run=False,
+                        silent=silent_mode,
+                        log_file=log_file
+                    )
+
+                    message = "The files have been organized successfully."
+                    print_and_log("-" * 50, silent_mode, log)
+                    print_and_log(message, silent_mode, log)
+                    print_and_log("-" * 50, silent_mode, log)
+                    break  # Exit the sorting method loop after successful operation
+                else:
+                    # Ask if the user wants to try another sorting method
+                    another_sort = get_yes_no("Would you like to choose another sorting method? (yes/no): ")
+                    if another_sort:
+                        continue  # Loop back to mode selection
+                    else:
+                        print("Operation canceled by the user.")
+                        break  # Exit the sorting method loop
+
+            # Ask if the user wants to organize another directory (interactive only).
+            # Deliberately checks the raw CLI args, not the config-file
+            # fallbacks: a config supplying input_path/mode still gets the
+            # run-again prompt, as it always has.
+            if args.input_path or args.mode:
+                break  # Non-interactive run: process once and exit
+            another_directory = get_yes_no("Would you like to organize another directory? (yes/no): ")
+            if not another_directory:
+                break  # Exit the main loop
+    finally:
+        if log_fh is not None:
+            try:
+                log_fh.close()
+            except Exception:
+                pass
 
 if __name__ == '__main__':
     main()
@@ -1,42 +1,187 @@
+import os
+import mmap
+import asyncio
+import itertools
 import requests
 import base64
-from typing import Generator, Dict, Any, Optional
+from typing import Generator, Dict, Any, Iterable, Optional, List
+
+# Optional async HTTP client; the sequential requests path below is used
+# when aiohttp is not installed
+try:
+    import aiohttp
+except Exception:
+    aiohttp = None
+
+# Optional accelerators: pybase64 encodes with SIMD (~4-8x stdlib) and
+# orjson serializes payloads straight to bytes without an intermediate
+# str copy of the base64 data. Both degrade gracefully to the stdlib.
+try:
+    import pybase64
+except Exception:
+    pybase64 = None
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
 
 OLLAMA_BASE_URL = "http://localhost:11434"
 
+# Cap on concurrently in-flight requests. Match this to the Ollama server's
+# own OLLAMA_NUM_PARALLEL setting; extra requests would just queue there.
+try:
+    OLLAMA_NUM_PARALLEL = int(os.environ.get("OLLAMA_NUM_PARALLEL", "4"))
+except ValueError:
+    OLLAMA_NUM_PARALLEL = 4
+
+# How many payloads are dispatched per batch window. Bounding the window
+# keeps memory flat on huge directories while still giving the server a
+# full batch to schedule together.
+try:
+    OLLAMA_BATCH_SIZE = int(os.environ.get("OLLAMA_BATCH_SIZE", "8"))
+except ValueError:
+    OLLAMA_BATCH_SIZE = 8
+
+# Shared session so every call reuses the same kept-alive TCP connection
+# instead of paying a fresh handshake per request
+_SESSION = requests.Session()
+_SESSION.mount("http://", requests.adapters.HTTPAdapter(pool_connections=32, pool_maxsize=32))
+
+
+def _encode_image(image_path: str) -> str:
+    """Return the base64 payload string for an image file.
+
+    The file is memory-mapped so b64encode reads it in a single pass
+    without first copying the bytes into a Python string; empty files
+    cannot be mmapped and are handled with a plain read.
+    """
+    encode = pybase64.b64encode_as_string if pybase64 is not None else (
+        lambda data: base64.b64encode(data).decode("ascii"))
+    with open(image_path, "rb") as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return encode(mapped)
+        except ValueError:
+            return encode(f.read())
+
+
+def _generate_url(base_url: Optional[str]) -> str:
+    return (base_url or OLLAMA_BASE_URL).rstrip("/") + "/api/generate"
+
+
+def _post_json(url: str, payload: Dict[str, Any]):
+    """POST payload via the shared session, serialized with orjson when available."""
+    if orjson is not None:
+        return _SESSION.post(url, data=orjson.dumps(payload), headers=_JSON_HEADERS)
+    return _SESSION.post(url, json=payload)
+
+
+def _parse_json(resp) -> Dict[str, Any]:
+    """Parse a requests response body, with orjson when available."""
+    if orjson is not None:
+        return orjson.loads(resp.content)
+    return resp.json()
+
 
 def generate_text(prompt: str, model: str = "llama3.2:3b", base_url: Optional[str] = None) -> str:
     """Call Ollama /api/generate for text-only prompts and return the full response text."""
-    url = (base_url or OLLAMA_BASE_URL).rstrip("/") + "/api/generate"
-    resp = requests.post(url, json={
+    resp = _post_json(_generate_url(base_url), {
         "model": model,
         "prompt": prompt,
         "stream": False,
     })
     resp.raise_for_status()
-    data = resp.json()
+    data = _parse_json(resp)
     # Some Ollama versions return {"response": "..."}
     return data.get("response", "")
 
 
 def analyze_image(image_path: str, prompt: str, model: str = "llava:7b", base_url: Optional[str] = None) -> str:
     """Call Ollama /api/generate for a vision model using a local image and return the full response text."""
-    with open(image_path, "rb") as f:
-        image_data = f.read()
-    image_base64 = base64.b64encode(image_data).decode("utf-8")
-
-    url = (base_url or OLLAMA_BASE_URL).rstrip("/") + "/api/generate"
-    resp = requests.post(url, json={
+    resp = _post_json(_generate_url(base_url), {
         "model": model,
         "prompt": prompt,
-        "images": [image_base64],
+        "images": [_encode_image(image_path)],
         "stream": False,
     })
     resp.raise_for_status()
-    data = resp.json()
+    data = _parse_json(resp)
     return data.get("response", "")
 
 
+def generate_batch(payloads: Iterable[Dict[str, Any]], base_url: Optional[str] = None) -> List[str]:
+    """POST several /api/generate payloads concurrently and return the
+    response texts in payload order.
+
+    Each HTTP round-trip is latency-bound on the Ollama server, so firing
+    them together (bounded by OLLAMA_NUM_PARALLEL) lets the server overlap
+    and batch the forward passes. payloads may be any iterable and is
+    consumed one coalescing window of OLLAMA_BATCH_SIZE at a time, so
+    callers can build payloads lazily — analyze_images base64-encodes its
+    images this way, keeping at most one window of encoded bodies alive.
+    Falls back to sequential requests when aiohttp is unavailable or for a
+    single payload.
+    """
+    url = _generate_url(base_url)
+    window = max(1, OLLAMA_BATCH_SIZE)
+    payloads = iter(payloads)
+    first_window = list(itertools.islice(payloads, window))
+    # A window of 1 gains nothing from the event loop; run it sequentially
+    # (this also covers single-payload calls, which fill at most one slot).
+    if aiohttp is None or window == 1 or len(first_window) <= 1:
+        results = []
+        for payload in itertools.chain(first_window, payloads):
+            resp = _post_json(url, payload)
+            resp.raise_for_status()
+            results.append(_parse_json(resp).get("response", ""))
+        return results
+
+    async def _run():
+        connector = aiohttp.TCPConnector(limit=OLLAMA_NUM_PARALLEL)
+        timeout = aiohttp.ClientTimeout(total=None)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            async def _one(payload):
+                if orjson is not None:
+                    request = session.post(url, data=orjson.dumps(payload), headers=_JSON_HEADERS)
+                else:
+                    request = session.post(url, json=payload)
+                async with request as resp:
+                    resp.raise_for_status()
+                    if orjson is not None:
+                        data = orjson.loads(await resp.read())
+                    else:
+                        data = await resp.json()
+                    return data.get("response", "")
+            results = []
+            chunk = first_window
+            while chunk:
+                results.extend(await asyncio.gather(*(_one(p) for p in chunk)))
+                chunk = list(itertools.islice(payloads, window))
+            return results
+
+    return asyncio.run(_run())
+
+
+def _warm_up_model(model: str, base_url: Optional[str]) -> None:
+    """Ask the server to load a model by generating a single token.
+
+    The first real request otherwise pays the model-load cost while any
+    parallel requests queue behind it. Errors are swallowed so an offline
+    server surfaces on the real request path, not here.
+    """
+    try:
+        _post_json(_generate_url(base_url), {
+            "model": model,
+            "prompt": "ping",
+            "stream": False,
+            "options": {"num_predict": 1},
+        }).raise_for_status()
+    except Exception:
+        pass
+
+
 class OllamaTextInference:
     """A tiny adapter to keep the existing interface (.create_completion) intact."""
 
@@ -44,10 +189,21 @@ class OllamaTextInference:
         self.model = model
         self.base_url = base_url or OLLAMA_BASE_URL
 
+    def warm_up(self) -> None:
+        """Pre-load the model so the first batch parallelizes server-side."""
+        _warm_up_model(self.model, self.base_url)
+
     def create_completion(self, prompt: str) -> Dict[str, Any]:
         text = generate_text(prompt, model=self.model, base_url=self.base_url)
         return {"choices": [{"text": text}]}
 
+    def create_completions(self, prompts: List[str]) -> List[Dict[str, Any]]:
+        """Run a batch of prompts concurrently; completions come back in
+        prompt order with the same shape as create_completion."""
+        payloads = [{"model": self.model, "prompt": p, "stream": False} for p in prompts]
+        texts = generate_batch(payloads, base_url=self.base_url)
+        return [{"choices": [{"text": t}]} for t in texts]
+
 
 class OllamaVLMInference:
     """A tiny adapter to keep the existing interface (._chat yielding deltas) intact.
@@ -61,6 +217,10 @@ class OllamaVLMInference:
         self.model = model
         self.base_url = base_url or OLLAMA_BASE_URL
 
+    def warm_up(self) -> None:
+        """Pre-load the model so the first batch parallelizes server-side."""
+        _warm_up_model(self.model, self.base_url)
+
     def _chat(self, prompt: str, image_path: str) -> Generator[Dict[str, Any], None, None]:
         content = analyze_image(image_path, prompt, model=self.model, base_url=self.base_url)
 
@@ -69,3 +229,21 @@ class OllamaVLMInference:
             return
 
         return _gen()
+
+    def analyze_images(self, prompt_image_pairs: List[tuple]) -> List[str]:
+        """Analyze (prompt, image_path) pairs concurrently; responses come
+        back in pair order.
+
+        Payloads are built lazily so only one dispatch window of
+        base64-encoded images is in memory at a time.
+        """
+        payloads = (
+            {
+                "model": self.model,
+                "prompt": prompt,
+                "images": [_encode_image(image_path)],
+                "stream": False,
+            }
+            for prompt, image_path in prompt_image_pairs
+        )
+        return generate_batch(payloads, base_url=self.base_url)